@@ -10,9 +10,10 @@ Description: This script creates an animation of the motion of the Double Pendul
              
 """
 
+import math
 import pygame
 import numpy as np
-from scipy.integrate import solve_ivp
+from double_pendulum_rhs import rk4_advance
 
 
 pygame.init()
@@ -29,7 +30,6 @@ GRAY = (200, 200, 200)
 GREEN = (0, 255, 0)
 
 
-g = 9.81  # gravity (m/s^2)
 # Initial parameters
 m1 = 1.0  # Mass of the first pendulum (kg)
 m2 = 1.0  # Mass of the second pendulum (kg)
@@ -39,38 +39,11 @@ c1 = 0.0  # Damping coefficient for the first pendulum (kg m^2/s)
 c2 = 0.0  # Damping coefficient for the second pendulum (kg m^2/s)
 
 
-def DoubleDampedPendulum(t, y):
-    theta1, z1, theta2, z2 = y
-
-    deltatheta = theta1 - theta2
-    dtheta1_dt = z1
-    dtheta2_dt = z2
-    denominator = ((m1 + m2) * np.power(l1, 2) * m2 * np.power(l2, 2)) - np.power(m2 * l1 * l2 * np.cos(deltatheta), 2)
-
-    dz1_dt = (m2 * np.power(l2, 2) * (-m2 * l1 * l2 * np.power(z2, 2) * np.sin(deltatheta) - (m1 + m2) * g * l1 * np.sin(theta1) - c1 * z1) \
-              - (m2 * l1 * l2 * np.cos(deltatheta) * (m2 * l1 * l2 * np.power(z1, 2) * np.sin(deltatheta) - m2 * g * l2 * np.sin(theta2) - c2 * z2))) \
-              / denominator
-
-    dz2_dt = (-m2 * l1 * l2 * np.cos(deltatheta) * (-m2 * l1 * l2 * np.power(z2, 2) * np.sin(deltatheta) - (m1 + m2) * g * l1 * np.sin(theta1) - c1 * z1) \
-              + ((m1 + m2) * np.power(l1, 2)) * (m2 * l1 * l2 * np.power(z1, 2) * np.sin(deltatheta) - m2 * g * l2 * np.sin(theta2) - c2 * z2)) \
-              / denominator
-
-    return [dtheta1_dt, dz1_dt, dtheta2_dt, dz2_dt]
-
-# Solve the differential equations
-y0 = [np.pi / 2, 0, np.pi / 2, 0]
-t_span = (0, 100)
-t_eval = np.linspace(0, 100, 1000)
-
-sol = solve_ivp(DoubleDampedPendulum, t_span, y0, t_eval=t_eval)
-theta1 = sol.y[0]
-theta2 = sol.y[2]
-
-# Transformation to cartesian coordinates (In pygame y = -y)
-x1 = l1 * np.sin(theta1)
-y1 = l1 * np.cos(theta1)  
-x2 = x1 + l2 * np.sin(theta2)
-y2 = y1 + l2 * np.cos(theta2)  
+# Initial state, advanced one frame at a time in the main loop
+y0 = (np.pi / 2, 0.0, np.pi / 2, 0.0)
+state = y0
+dt = 0.1  # Simulated time per frame (s)
+substeps = 10  # Minimum RK4 steps per frame; rk4_advance takes more when the pendulum is stiffer
 
 # Slider 
 slider_width = 300
@@ -93,7 +66,6 @@ dragging = None
 # Main loop
 clock = pygame.time.Clock()
 running = True
-frame = 0
 
 def draw_slider(slider, value, min_val, max_val, label):
     pygame.draw.rect(screen, GRAY, slider)
@@ -103,17 +75,6 @@ def draw_slider(slider, value, min_val, max_val, label):
     text = font.render(f"{label}: {value:.2f}", True, BLACK)
     screen.blit(text, (slider.x, slider.y - 20))
 
-def update_simulation():
-    global sol, theta1, theta2, x1, y1, x2, y2, frame
-    sol = solve_ivp(DoubleDampedPendulum, t_span, y0, t_eval=t_eval)
-    theta1 = sol.y[0]
-    theta2 = sol.y[2]
-    x1 = l1 * np.sin(theta1)
-    y1 = l1 * np.cos(theta1)
-    x2 = x1 + l2 * np.sin(theta2)
-    y2 = y1 + l2 * np.cos(theta2)
-    frame = 0
-
 while running:
     time_delta = clock.tick(30) / 1000.0
 
@@ -137,7 +98,6 @@ while running:
 
         if event.type == pygame.MOUSEBUTTONUP:
             dragging = None
-            update_simulation()  # Update simulation only when dragging stops
 
         if event.type == pygame.MOUSEMOTION and dragging:
             mouse_x, _ = event.pos
@@ -156,15 +116,24 @@ while running:
 
     screen.fill(WHITE)
 
+    # Slider values take effect on the very next step
+    params = (m1, m2, l1, l2, c1, c2)
+    state = rk4_advance(state, dt, params, substeps)
+    if not np.all(np.isfinite(state)):
+        state = y0  # Restart instead of drawing a state that can no longer be converted to pixels
+    theta1, z1, theta2, z2 = state
+
+    # Transformation to cartesian coordinates (In pygame y = -y)
+    px1 = WIDTH // 2 + int(100 * l1 * math.sin(theta1))
+    py1 = HEIGHT // 2 + int(100 * l1 * math.cos(theta1))
+    px2 = px1 + int(100 * l2 * math.sin(theta2))
+    py2 = py1 + int(100 * l2 * math.cos(theta2))
+
     # Draw the pendulum
-    if frame < len(t_eval):
-        pygame.draw.line(screen, BLACK, (WIDTH // 2, HEIGHT // 2),
-                         (WIDTH // 2 + int(100 * x1[frame]), HEIGHT // 2 + int(100 * y1[frame])), 2)
-        pygame.draw.line(screen, BLACK, (WIDTH // 2 + int(100 * x1[frame]), HEIGHT // 2 + int(100 * y1[frame])),
-                         (WIDTH // 2 + int(100 * x2[frame]), HEIGHT // 2 + int(100 * y2[frame])), 2)
-        pygame.draw.circle(screen, BLUE, (WIDTH // 2 + int(100 * x1[frame]), HEIGHT // 2 + int(100 * y1[frame])), 10)
-        pygame.draw.circle(screen, RED, (WIDTH // 2 + int(100 * x2[frame]), HEIGHT // 2 + int(100 * y2[frame])), 10)
-        frame += 1
+    pygame.draw.line(screen, BLACK, (WIDTH // 2, HEIGHT // 2), (px1, py1), 2)
+    pygame.draw.line(screen, BLACK, (px1, py1), (px2, py2), 2)
+    pygame.draw.circle(screen, BLUE, (px1, py1), 10)
+    pygame.draw.circle(screen, RED, (px2, py2), 10)
 
     # Draw sliders 
     draw_slider(slider_m1, m1, 0.01, 10.0, "Mass 1 (m1)")
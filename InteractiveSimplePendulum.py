@@ -7,9 +7,10 @@ Description: This script creates a simple animation of the motion of the Simple
              \frac{d^2\theta}{dt^2} + \frac{b}{m l^2} \frac{d\theta}{dt} + \frac{g}{l} \sin(\theta) = 0
 """
 
+import math
 import pygame
 import numpy as np
-from scipy.integrate import solve_ivp
+from numba import njit
 
 
 pygame.init()
@@ -32,23 +33,39 @@ m = 1.0  # Mass of the pendulum (kg)
 l = 1.0  # Length of the pendulum (m)
 b = 0.0  # Damping coefficient for the pendulum (kg m^2/s)
 
-def SimplePemdulum(t, y):
+@njit(cache=True, fastmath=True)
+def SimplePemdulum(t, y, k_damp, k_grav):
+    # k_damp = b/(m l^2) and k_grav = g/l are computed by the caller, not on every evaluation
     theta, z = y
     dtheta_dt = z
-    dz_dt =  -(b/(m * np.power(l, 2)))*z - (g/l)*np.sin(theta)
-    return [dtheta_dt, dz_dt]
-
-# Solving The ODE
-y0 = [np.pi/2, 0]
-t_span = (0, 50)
-t_eval = np.linspace(0, 50, 500)
-
-sol = solve_ivp(SimplePemdulum, t_span, y0, t_eval=t_eval)
-theta = sol.y[0]
-
-# Transformation to cartesian coordinates
-x1 = l*np.sin(theta)
-y1 = l*np.cos(theta)
+    dz_dt =  -k_damp*z - k_grav*math.sin(theta)
+    return (dtheta_dt, dz_dt)
+
+@njit(cache=True, fastmath=True)
+def rk4_step(y, dt, params):
+    # One classic RK4 step on a state tuple; the system is autonomous, so t is irrelevant to the RHS
+    k1 = SimplePemdulum(0.0, y, *params)
+    k2 = SimplePemdulum(0.0, (y[0] + dt/2*k1[0], y[1] + dt/2*k1[1]), *params)
+    k3 = SimplePemdulum(0.0, (y[0] + dt/2*k2[0], y[1] + dt/2*k2[1]), *params)
+    k4 = SimplePemdulum(0.0, (y[0] + dt*k3[0], y[1] + dt*k3[1]), *params)
+    return (y[0] + dt/6*(k1[0] + 2*k2[0] + 2*k3[0] + k4[0]),
+            y[1] + dt/6*(k1[1] + 2*k2[1] + 2*k3[1] + k4[1]))
+
+@njit(cache=True)
+def rk4_advance(y, dt, params, min_substeps):
+    # Cover dt with at least min_substeps RK4 steps, and enough of them that h * (k_damp + sqrt(k_grav)) < 2,
+    # which keeps every step inside RK4's stability region however stiff the sliders make the pendulum
+    k_damp, k_grav = params
+    substeps = max(min_substeps, int(math.ceil(dt*(k_damp + math.sqrt(k_grav))/2)))
+    for _ in range(substeps):
+        y = rk4_step(y, dt/substeps, params)
+    return y
+
+# Initial state, advanced one frame at a time in the main loop
+y0 = (np.pi/2, 0.0)
+state = y0
+dt = 0.1  # Simulated time per frame (s)
+substeps = 10  # Minimum RK4 steps per frame; rk4_advance takes more when the pendulum is stiffer
 
 # Slider 
 slider_width = 300
@@ -65,7 +82,6 @@ dragging = None
 
 clock = pygame.time.Clock()
 running = True
-frame = 0
 
 def draw_slider(slider, value, min_val, max_val, label):
     pygame.draw.rect(screen, GRAY, slider)
@@ -75,14 +91,6 @@ def draw_slider(slider, value, min_val, max_val, label):
     text = font.render(f"{label}: {value:.2f}", True, BLACK)
     screen.blit(text, (slider.x, slider.y - 20))
 
-def update_simulation():
-    global sol, theta1, theta2, x1, y1, x2, y2, frame
-    sol = solve_ivp(SimplePemdulum, t_span, y0, t_eval=t_eval)
-    theta = sol.y[0]
-    x1 = l * np.sin(theta)
-    y1 = l * np.cos(theta)
-    frame = 0
-
 while running:
     time_delta = clock.tick(30)/1000.0
 
@@ -100,7 +108,6 @@ while running:
         
         if event.type == pygame.MOUSEBUTTONUP:
             dragging = None
-            update_simulation()
 
         if event.type == pygame.MOUSEMOTION and dragging:
             mouse_x, _ = event.pos
@@ -109,15 +116,23 @@ while running:
             elif dragging == "l":
                 l = np.clip((mouse_x - slider_l.x) / slider_l.width * 10.0, 0.01, 10.0)
             elif dragging == "b":
-                c = np.clip((mouse_x - slider_b.x) / slider_b.width * 1.0, 0.0, 1.0)
+                b = np.clip((mouse_x - slider_b.x) / slider_b.width * 1.0, 0.0, 1.0)
 
     screen.fill(WHITE)
 
-    if frame < len(t_eval):
-        pygame.draw.line(screen, BLACK, (WIDTH // 2, HEIGHT // 2),
-                         (WIDTH // 2 + int(100 * x1[frame]), HEIGHT // 2 + int(100 * y1[frame])), 2)
-        pygame.draw.circle(screen, BLUE, (WIDTH // 2 + int(100 * x1[frame]), HEIGHT // 2 + int(100 * y1[frame])), 10)
-        frame += 1
+    # Slider values take effect on the very next step
+    params = (b/(m * (l * l)), g/l)
+    state = rk4_advance(state, dt, params, substeps)
+    if not np.all(np.isfinite(state)):
+        state = y0  # Restart instead of drawing a state that can no longer be converted to pixels
+    theta, z = state
+
+    # Transformation to cartesian coordinates
+    px1 = WIDTH // 2 + int(100 * l * math.sin(theta))
+    py1 = HEIGHT // 2 + int(100 * l * math.cos(theta))
+
+    pygame.draw.line(screen, BLACK, (WIDTH // 2, HEIGHT // 2), (px1, py1), 2)
+    pygame.draw.circle(screen, BLUE, (px1, py1), 10)
     
     draw_slider(slider_m, m, 0.01, 10.0, "Mass (m)")
     draw_slider(slider_l, l, 0.01, 10.0, "Length (l)")
@@ -0,0 +1,96 @@
+"""
+File: double_pendulum_rhs.py
+Date: 14/10/2026
+Description: Equations of motion of the Double Pendulum and the RK4 step used to integrate them, shared by
+             InteractiveDoublePendulum.py and sweep.py so Numba compiles and caches them only once.
+             States and derivatives are plain 4-tuples, so nothing is heap-allocated per step and the same
+             RHS also compiles as a CUDA device function.
+             The equations that governs the motion of this type of pendulum is given by:
+             \ddot{\theta}_1 = \frac{1}{\det(\mathbf{M})} \left[ m_2 l_2^2 \left( -m_2 l_1 l_2 \dot{\theta}_2^2 \sin(\theta_1 - \theta_2) - (m_1 + m_2) g l_1 \sin \theta_1 - c_1 \dot{\theta}_1 \right) - m_2 l_1 l_2 \cos(\theta_1 - \theta_2) \left( m_2 l_1 l_2 \dot{\theta}_1^2 \sin(\theta_1 - \theta_2) - m_2 g l_2 \sin \theta_2 - c_2 \dot{\theta}_2 \right) \right]
+             \ddot{\theta}_2 = \frac{1}{\det(\mathbf{M})} \left[ -m_2 l_1 l_2 \cos(\theta_1 - \theta_2) \left( -m_2 l_1 l_2 \dot{\theta}_2^2 \sin(\theta_1 - \theta_2) - (m_1 + m_2) g l_1 \sin \theta_1 - c_1 \dot{\theta}_1 \right) + (m_1 + m_2) l_1^2 \left( m_2 l_1 l_2 \dot{\theta}_1^2 \sin(\theta_1 - \theta_2) - m_2 g l_2 \sin \theta_2 - c_2 \dot{\theta}_2 \right) \right]
+             \det(\mathbf{M}) = (m_1 + m_2) l_1^2 \cdot m_2 l_2^2 - (m_2 l_1 l_2 \cos(\theta_1 - \theta_2))^2.
+"""
+
+import math
+from numba import njit
+
+
+g = 9.81  # gravity (m/s^2)
+
+
+@njit(cache=True, fastmath=True, error_model="numpy")
+def DoubleDampedPendulum(t, y, m1, m2, l1, l2, c1, c2):
+    theta1, z1, theta2, z2 = y
+
+    deltatheta = theta1 - theta2
+    dtheta1_dt = z1
+    dtheta2_dt = z2
+
+    # Each trigonometric term is evaluated only once per call
+    sin_delta = math.sin(deltatheta)
+    cos_delta = math.cos(deltatheta)
+    sin_theta1 = math.sin(theta1)
+    sin_theta2 = math.sin(theta2)
+
+    # Mass matrix M = [[M11, A], [A, M22]] and generalised forces T1, T2, so that M (dz1, dz2) = (T1, T2)
+    m2l1l2 = m2 * l1 * l2
+    A = m2l1l2 * cos_delta
+    B = m2l1l2 * sin_delta
+    M11 = (m1 + m2) * l1 * l1
+    M22 = m2 * l2 * l2
+    T1 = -B * z2 * z2 - (m1 + m2) * g * l1 * sin_theta1 - c1 * z1
+    T2 = B * z1 * z1 - m2 * g * l2 * sin_theta2 - c2 * z2
+    det = M11 * M22 - A * A
+
+    dz1_dt = (M22 * T1 - A * T2) / det
+    dz2_dt = (-A * T1 + M11 * T2) / det
+
+    return (dtheta1_dt, dz1_dt, dtheta2_dt, dz2_dt)
+
+@njit(cache=True, fastmath=True)
+def add_scaled(y, h, k):
+    # y + h * k for 4-tuples
+    return (y[0] + h * k[0], y[1] + h * k[1], y[2] + h * k[2], y[3] + h * k[3])
+
+@njit(cache=True, fastmath=True)
+def rk4_step(y, dt, params):
+    # One classic RK4 step on a state tuple; the system is autonomous, so t is irrelevant to the RHS
+    k1 = DoubleDampedPendulum(0.0, y, *params)
+    k2 = DoubleDampedPendulum(0.0, add_scaled(y, dt / 2, k1), *params)
+    k3 = DoubleDampedPendulum(0.0, add_scaled(y, dt / 2, k2), *params)
+    k4 = DoubleDampedPendulum(0.0, add_scaled(y, dt, k3), *params)
+    return (y[0] + dt / 6 * (k1[0] + 2 * k2[0] + 2 * k3[0] + k4[0]),
+            y[1] + dt / 6 * (k1[1] + 2 * k2[1] + 2 * k3[1] + k4[1]),
+            y[2] + dt / 6 * (k1[2] + 2 * k2[2] + 2 * k3[2] + k4[2]),
+            y[3] + dt / 6 * (k1[3] + 2 * k2[3] + 2 * k3[3] + k4[3]))
+
+@njit(cache=True, fastmath=True, error_model="numpy")
+def stiffness_rate(y, params):
+    # Estimate of how fast the linearised motion at y can grow or decay (1/s); RK4 stays stable while
+    # h * rate < 2. The inverse mass matrix at the current angles is bounded by its infinity norm.
+    theta1, z1, theta2, z2 = y
+    m1, m2, l1, l2, c1, c2 = params
+    m2l1l2 = m2 * l1 * l2
+    A = m2l1l2 * math.cos(theta1 - theta2)
+    B = m2l1l2 * math.sin(theta1 - theta2)
+    M11 = (m1 + m2) * l1 * l1
+    M22 = m2 * l2 * l2
+    inv_M = (max(M11, M22) + abs(A)) / (M11 * M22 - A * A)
+    # Damping and velocity-squared forces act on the velocities, gravity and centripetal terms on the angles
+    friction = inv_M * (max(c1, c2) + 2 * abs(B) * (abs(z1) + abs(z2)))
+    spring = math.sqrt(inv_M * (g * max((m1 + m2) * l1, m2 * l2) + m2l1l2 * (z1 * z1 + z2 * z2)))
+    return max(friction, spring)
+
+@njit(cache=True, fastmath=False, error_model="numpy")
+def rk4_advance(y, dt, params, min_substeps):
+    # Cover dt with RK4 steps of at most dt / min_substeps, shortened whenever the current state is stiffer.
+    # The flags are set explicitly because Numba otherwise compiles a callee with its caller's, and under
+    # fastmath the finiteness check could be assumed away.
+    t = 0.0
+    while t < dt and math.isfinite(y[0] + y[1] + y[2] + y[3]):
+        h = min(dt / min_substeps, 2.0 / stiffness_rate(y, params), dt - t)
+        if not h > 0.0:
+            break
+        y = rk4_step(y, h, params)
+        t += h
+    return y
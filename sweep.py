@@ -0,0 +1,109 @@
+"""
+File: sweep.py
+Date: 14/10/2026
+Description: This script integrates the Double Pendulum for a whole grid of initial angles at once
+             and plots how long each starting configuration takes before the second arm flips over
+             the pivot (|theta_2| > pi). Every trajectory is independent, so they are spread over all
+             CPU cores with numba.prange.
+             Running it as `python sweep.py --cuda` uses one GPU thread per trajectory with numba.cuda
+             instead; both paths share the RK4 step loop in double_pendulum_rhs.py. The GPU path has only
+             been checked under NUMBA_ENABLE_CUDASIM, not compiled on GPU hardware, so it is opt-in.
+"""
+
+import sys
+import numpy as np
+import matplotlib.pyplot as plt
+from numba import cuda, njit, prange
+from double_pendulum_rhs import rk4_advance
+
+
+# Parameters
+m1 = 1.0  # Mass of the first pendulum (kg)
+m2 = 1.0  # Mass of the second pendulum (kg)
+l1 = 1.0  # Length of the first pendulum (m)
+l2 = 1.0  # Length of the second pendulum (m)
+c1 = 0.0  # Damping coefficient for the first pendulum (kg m^2/s)
+c2 = 0.0  # Damping coefficient for the second pendulum (kg m^2/s)
+
+
+@njit(cache=True, fastmath=True)
+def rk4_integrate(y0, t_eval, params):
+    # RK4 on the regular t_eval grid, one row per output time; each interval is split into RK4 steps
+    # short enough for the current stiffness
+    dt = t_eval[1] - t_eval[0]
+    out = np.empty((t_eval.shape[0], 4))
+    y = (y0[0], y0[1], y0[2], y0[3])
+    for i in range(t_eval.shape[0]):
+        if i > 0:
+            y = rk4_advance(y, dt, params, 1)
+        out[i, 0] = y[0]
+        out[i, 1] = y[1]
+        out[i, 2] = y[2]
+        out[i, 3] = y[3]
+    return out
+
+@njit(parallel=True, cache=True, fastmath=True)
+def sweep(y0s, t_eval, params):
+    # Independent trajectories for every row of y0s, shape (N, len(t_eval), 4)
+    N = y0s.shape[0]
+    out = np.empty((N, t_eval.shape[0], y0s.shape[1]))
+    for i in prange(N):
+        out[i] = rk4_integrate(y0s[i], t_eval, params)
+    return out
+
+# GPU version: the same step loop compiled as a device function. Numba's CUDA target compiles the jitted
+# functions it calls (rk4_step, stiffness_rate and the RHS) as device functions as well.
+rk4_advance_device = cuda.jit(device=True)(rk4_advance.py_func)
+
+@cuda.jit
+def sweep_kernel(y0s, t_eval, out, params):
+    # One thread per trajectory
+    i = cuda.grid(1)
+    if i < y0s.shape[0]:
+        dt = t_eval[1] - t_eval[0]
+        y = (y0s[i, 0], y0s[i, 1], y0s[i, 2], y0s[i, 3])
+        for j in range(t_eval.shape[0]):
+            if j > 0:
+                y = rk4_advance_device(y, dt, params, 1)
+            out[i, j, 0] = y[0]
+            out[i, j, 1] = y[1]
+            out[i, j, 2] = y[2]
+            out[i, j, 3] = y[3]
+
+def sweep_cuda(y0s, t_eval, params, threads_per_block=128):
+    # Same result as sweep(), computed on the GPU
+    d_y0s = cuda.to_device(y0s)
+    d_t = cuda.to_device(t_eval)
+    d_out = cuda.device_array((y0s.shape[0], t_eval.shape[0], y0s.shape[1]))
+    blocks = (y0s.shape[0] + threads_per_block - 1) // threads_per_block
+    sweep_kernel[blocks, threads_per_block](d_y0s, d_t, d_out, params)
+    return d_out.copy_to_host()
+
+# Grid of initial angles, both arms starting at rest; +-pi are left out since there the second arm
+# already starts over the pivot
+n = 64
+angles = np.linspace(-np.pi, np.pi, n + 2)[1:-1]
+theta1_0, theta2_0 = np.meshgrid(angles, angles, indexing="ij")
+y0s = np.zeros((n * n, 4))
+y0s[:, 0] = theta1_0.ravel()
+y0s[:, 2] = theta2_0.ravel()
+
+t_eval = np.linspace(0, 20, 801)
+params = (m1, m2, l1, l2, c1, c2)
+use_cuda = "--cuda" in sys.argv  # Unverified on real GPUs, see the description above
+
+sol = sweep_cuda(y0s, t_eval, params) if use_cuda else sweep(y0s, t_eval, params)
+
+# Time of the first flip of the second arm (NaN if it never flips)
+flipped = np.abs(sol[:, :, 2]) > np.pi
+flip_time = np.where(flipped.any(axis=1), t_eval[flipped.argmax(axis=1)], np.nan).reshape(n, n)
+
+fig, ax = plt.subplots(figsize=(7, 6))
+half = (angles[1] - angles[0]) / 2
+edges = (angles[0] - half, angles[-1] + half)
+im = ax.imshow(flip_time.T, origin="lower", extent=edges + edges, cmap="viridis")
+ax.set_xlabel(r"$\theta_1(0)$ (rad)")
+ax.set_ylabel(r"$\theta_2(0)$ (rad)")
+ax.set_title("Double Pendulum: time until the second arm flips")
+fig.colorbar(im, ax=ax, label="t (s)")
+plt.show()